@@ -4,7 +4,12 @@
 Custom element classes related to the styles part
 """
 
+import sys
+
+from lxml import etree
+
 from ..enum.style import WD_STYLE_TYPE
+from .ns import nsmap, qn
 from .simpletypes import ST_DecimalNumber, ST_OnOff, ST_String
 from .xmlchemy import (
     BaseOxmlElement, OptionalAttribute, RequiredAttribute, ZeroOrMore,
@@ -12,23 +17,85 @@ from .xmlchemy import (
 )
 
 
+# Clark-notation tag names resolved once at import time; qn() shows up hot
+# in profiles when re-evaluated on every child or attribute access.
+# Interning lets downstream string comparisons take the pointer-equality
+# fast path.
+_q_basedOn = sys.intern(qn('w:basedOn'))
+_q_default = sys.intern(qn('w:default'))
+_q_locked = sys.intern(qn('w:locked'))
+_q_name = sys.intern(qn('w:name'))
+_q_next = sys.intern(qn('w:next'))
+_q_qFormat = sys.intern(qn('w:qFormat'))
+_q_semiHidden = sys.intern(qn('w:semiHidden'))
+_q_style = sys.intern(qn('w:style'))
+_q_styleId = sys.intern(qn('w:styleId'))
+_q_type = sys.intern(qn('w:type'))
+_q_uiPriority = sys.intern(qn('w:uiPriority'))
+_q_unhideWhenUsed = sys.intern(qn('w:unhideWhenUsed'))
+_q_val = sys.intern(qn('w:val'))
+
+# compiled once at import time; the $name variable binding reuses the one
+# compiled expression for every lookup and is immune to quoting problems
+# with names containing quote characters
+_xpath_lsdException_by_name = etree.XPath(
+    'w:lsdException[@w:name=$name]', namespaces={'w': nsmap['w']}
+)
+
+
+_style_type_xml_cache = {}
+
+
+def _style_type_to_xml(style_type):
+    """
+    Return the XML attribute value corresponding to *style_type*, memoizing
+    the WD_STYLE_TYPE.to_xml() enumeration conversion.
+    """
+    type_xml = _style_type_xml_cache.get(style_type)
+    if type_xml is None:
+        type_xml = WD_STYLE_TYPE.to_xml(style_type)
+        _style_type_xml_cache[style_type] = type_xml
+    return type_xml
+
+
+def _on_off_val(element):
+    """
+    Return the boolean value of the `w:val` attribute of *element*, |True|
+    if the attribute is not present. Direct-read equivalent of the
+    `CT_OnOff.val` descriptor.
+    """
+    val = element.get(_q_val)
+    if val is None:
+        return True
+    return ST_OnOff.convert_from_xml(val)
+
+
+# style names whose style id is not simply the name with spaces removed
+_styleId_from_name_map = {
+    'caption':   'Caption',
+    'heading 1': 'Heading1',
+    'heading 2': 'Heading2',
+    'heading 3': 'Heading3',
+    'heading 4': 'Heading4',
+    'heading 5': 'Heading5',
+    'heading 6': 'Heading6',
+    'heading 7': 'Heading7',
+    'heading 8': 'Heading8',
+    'heading 9': 'Heading9',
+}
+
+
 def styleId_from_name(name):
     """
     Return the style id corresponding to *name*, taking into account
     special-case names such as 'Heading 1'.
     """
-    return {
-        'caption':   'Caption',
-        'heading 1': 'Heading1',
-        'heading 2': 'Heading2',
-        'heading 3': 'Heading3',
-        'heading 4': 'Heading4',
-        'heading 5': 'Heading5',
-        'heading 6': 'Heading6',
-        'heading 7': 'Heading7',
-        'heading 8': 'Heading8',
-        'heading 9': 'Heading9',
-    }.get(name, name.replace(' ', ''))
+    styleId = _styleId_from_name_map.get(name)
+    if styleId is not None:
+        return styleId
+    if ' ' not in name:
+        return name
+    return name.replace(' ', '')
 
 
 class CT_LatentStyles(BaseOxmlElement):
@@ -61,7 +128,7 @@ class CT_LatentStyles(BaseOxmlElement):
         Return the `w:lsdException` child having *name*, or |None| if not
         found.
         """
-        found = self.xpath('w:lsdException[@w:name="%s"]' % name)
+        found = _xpath_lsdException_by_name(self, name=name)
         if not found:
             return None
         return found[0]
@@ -138,17 +205,21 @@ class CT_Style(BaseOxmlElement):
         """
         Value of `w:basedOn/@w:val` or |None| if not present.
         """
-        basedOn = self.basedOn
+        basedOn = self.find(_q_basedOn)
         if basedOn is None:
             return None
-        return basedOn.val
+        return basedOn.get(_q_val)
 
     @basedOn_val.setter
     def basedOn_val(self, value):
+        basedOn = self.find(_q_basedOn)
         if value is None:
-            self._remove_basedOn()
+            if basedOn is not None:
+                self.remove(basedOn)
+        elif basedOn is not None:
+            basedOn.val = value
         else:
-            self.get_or_add_basedOn().val = value
+            self._add_basedOn().val = value
 
     @property
     def base_style(self):
@@ -156,14 +227,11 @@ class CT_Style(BaseOxmlElement):
         Sibling CT_Style element this style is based on or |None| if no base
         style or base style not found.
         """
-        basedOn = self.basedOn
-        if basedOn is None:
+        basedOn_val = self.basedOn_val
+        if basedOn_val is None:
             return None
         styles = self.getparent()
-        base_style = styles.get_by_id(basedOn.val)
-        if base_style is None:
-            return None
-        return base_style
+        return styles.get_by_id(basedOn_val)  # None if not found
 
     def delete(self):
         """
@@ -176,10 +244,10 @@ class CT_Style(BaseOxmlElement):
         """
         Value of `w:locked/@w:val` or |False| if not present.
         """
-        locked = self.locked
+        locked = self.find(_q_locked)
         if locked is None:
             return False
-        return locked.val
+        return _on_off_val(locked)
 
     @locked_val.setter
     def locked_val(self, value):
@@ -193,17 +261,21 @@ class CT_Style(BaseOxmlElement):
         """
         Value of ``<w:name>`` child or |None| if not present.
         """
-        name = self.name
+        name = self.find(_q_name)
         if name is None:
             return None
-        return name.val
+        return name.get(_q_val)
 
     @name_val.setter
     def name_val(self, value):
-        self._remove_name()
-        if value is not None:
-            name = self._add_name()
+        name = self.find(_q_name)
+        if value is None:
+            if name is not None:
+                self.remove(name)
+        elif name is not None:
             name.val = value
+        else:
+            self._add_name().val = value
 
     @property
     def next_style(self):
@@ -212,21 +284,21 @@ class CT_Style(BaseOxmlElement):
         or |None| if no value is present or no style with that style id
         is found.
         """
-        next = self.next
+        next = self.find(_q_next)
         if next is None:
             return None
         styles = self.getparent()
-        return styles.get_by_id(next.val)  # None if not found
+        return styles.get_by_id(next.get(_q_val))  # None if not found
 
     @property
     def qFormat_val(self):
         """
         Value of `w:qFormat/@w:val` or |False| if not present.
         """
-        qFormat = self.qFormat
+        qFormat = self.find(_q_qFormat)
         if qFormat is None:
             return False
-        return qFormat.val
+        return _on_off_val(qFormat)
 
     @qFormat_val.setter
     def qFormat_val(self, value):
@@ -239,27 +311,31 @@ class CT_Style(BaseOxmlElement):
         """
         Value of ``<w:semiHidden>`` child or |False| if not present.
         """
-        semiHidden = self.semiHidden
+        semiHidden = self.find(_q_semiHidden)
         if semiHidden is None:
             return False
-        return semiHidden.val
+        return _on_off_val(semiHidden)
 
     @semiHidden_val.setter
     def semiHidden_val(self, value):
-        self._remove_semiHidden()
-        if bool(value) is True:
-            semiHidden = self._add_semiHidden()
+        semiHidden = self.find(_q_semiHidden)
+        if bool(value) is not True:
+            if semiHidden is not None:
+                self.remove(semiHidden)
+        elif semiHidden is not None:
             semiHidden.val = value
+        else:
+            self._add_semiHidden().val = value
 
     @property
     def uiPriority_val(self):
         """
         Value of ``<w:uiPriority>`` child or |None| if not present.
         """
-        uiPriority = self.uiPriority
+        uiPriority = self.find(_q_uiPriority)
         if uiPriority is None:
             return None
-        return uiPriority.val
+        return ST_DecimalNumber.convert_from_xml(uiPriority.get(_q_val))
 
     @uiPriority_val.setter
     def uiPriority_val(self, value):
@@ -273,10 +349,10 @@ class CT_Style(BaseOxmlElement):
         """
         Value of `w:unhideWhenUsed/@w:val` or |False| if not present.
         """
-        unhideWhenUsed = self.unhideWhenUsed
+        unhideWhenUsed = self.find(_q_unhideWhenUsed)
         if unhideWhenUsed is None:
             return False
-        return unhideWhenUsed.val
+        return _on_off_val(unhideWhenUsed)
 
     @unhideWhenUsed_val.setter
     def unhideWhenUsed_val(self, value):
@@ -296,56 +372,102 @@ class CT_Styles(BaseOxmlElement):
     style = ZeroOrMore('w:style', successors=())
     del _tag_seq
 
+    # lazily-built {styleId: CT_Style} and {name: CT_Style} indexes; these
+    # live on the element proxy, which lxml keeps unique per element while
+    # any reference is held
+    _id_index = None
+    _name_index = None
+
+    def add_style(self):
+        """
+        Return a new `<w:style>` element added at the end of the sequence of
+        `w:style` children. Invalidates the cached style indexes.
+        """
+        self._id_index = None
+        self._name_index = None
+        return self._add_style()
+
     def add_style_of_type(self, name, style_type, builtin):
         """
         Return a newly added `w:style` element having *name* and
         *style_type*. `w:style/@customStyle` is set based on the value of
         *builtin*.
         """
+        id_index, name_index = self._id_index, self._name_index
+        styleId = styleId_from_name(name)
         style = self.add_style()
         style.type = style_type
         style.customStyle = None if builtin else True
-        style.styleId = styleId_from_name(name)
+        style.styleId = styleId
         style.name_val = name
+        # the new style is fully keyed now, so an already-built index can be
+        # maintained with an O(1) insert instead of discarded and rebuilt
+        # with an O(N) scan on the next lookup
+        if id_index is not None:
+            id_index.setdefault(styleId, style)
+            self._id_index = id_index
+        if name_index is not None:
+            name_index.setdefault(name, style)
+            self._name_index = name_index
         return style
 
     def default_for(self, style_type):
         """
         Return `w:style[@w:type="*{style_type}*][-1]` or |None| if not found.
         """
-        default_styles_for_type = [
-            s for s in self._iter_styles()
-            if s.type == style_type and s.default
-        ]
-        if not default_styles_for_type:
-            return None
+        # compare raw attribute values so non-matching styles, the great
+        # majority, skip the descriptor and simple-type conversion machinery
+        type_xml = _style_type_to_xml(style_type)
         # spec calls for last default in document order
-        return default_styles_for_type[-1]
+        default_style = None
+        for style in self._iter_styles():
+            if style.get(_q_type) != type_xml:
+                continue
+            if style.get(_q_default) not in ('1', 'true', 'on'):
+                continue
+            default_style = style
+        return default_style
 
     def get_by_id(self, styleId):
         """
         Return the ``<w:style>`` child element having ``styleId`` attribute
         matching *styleId*, or |None| if not found.
         """
-        xpath = 'w:style[@w:styleId="%s"]' % styleId
-        try:
-            return self.xpath(xpath)[0]
-        except IndexError:
-            return None
+        index = self._id_index
+        if index is not None:
+            style = index.get(styleId)
+            if (style is not None and style.getparent() is self
+                    and style.get(_q_styleId) == styleId):
+                return style
+        # build (or rebuild, on a possibly-stale miss) the id index; first
+        # matching style wins, consistent with an XPath [0] lookup
+        index = {}
+        for style in self._iter_styles():
+            index.setdefault(style.get(_q_styleId), style)
+        self._id_index = index
+        return index.get(styleId)
 
     def get_by_name(self, name):
         """
         Return the ``<w:style>`` child element having ``<w:name>`` child
         element with value *name*, or |None| if not found.
         """
-        xpath = 'w:style[w:name/@w:val="%s"]' % name
-        try:
-            return self.xpath(xpath)[0]
-        except IndexError:
-            return None
+        index = self._name_index
+        if index is not None:
+            style = index.get(name)
+            if (style is not None and style.getparent() is self
+                    and style.name_val == name):
+                return style
+        # build (or rebuild, on a possibly-stale miss) the name index; first
+        # matching style wins, consistent with an XPath [0] lookup
+        index = {}
+        for style in self._iter_styles():
+            index.setdefault(style.name_val, style)
+        self._name_index = index
+        return index.get(name)
 
     def _iter_styles(self):
         """
         Generate each of the `w:style` child elements in document order.
         """
-        return (style for style in self.xpath('w:style'))
+        return self.iterchildren(_q_style)
@@ -17,7 +17,7 @@ from docx.image.tiff import Tiff
 from docx.opc.constants import CONTENT_TYPE as CT
 from docx.shared import Emu, Length
 
-from ..unitutil.file import test_file
+from ..unitutil.file import test_file, test_file_bytes
 from ..unitutil.mock import (
     ANY,
     class_mock,
@@ -121,14 +121,14 @@ class DescribeImage(object):
         ext, content_type, px_width, px_height, horz_dpi, vert_dpi = (
             characteristics
         )
-        with open(test_file(image_path), 'rb') as stream:
-            image = Image.from_file(stream)
-            assert image.content_type == content_type
-            assert image.ext == ext
-            assert image.px_width == px_width
-            assert image.px_height == px_height
-            assert image.horz_dpi == horz_dpi
-            assert image.vert_dpi == vert_dpi
+        stream = BytesIO(test_file_bytes(image_path))
+        image = Image.from_file(stream)
+        assert image.content_type == content_type
+        assert image.ext == ext
+        assert image.px_width == px_width
+        assert image.px_height == px_height
+        assert image.horz_dpi == horz_dpi
+        assert image.vert_dpi == vert_dpi
 
     # fixtures -------------------------------------------------------
 
@@ -154,9 +154,7 @@ class DescribeImage(object):
 
     @pytest.fixture
     def from_filelike_fixture(self, _from_stream_, image_):
-        image_path = test_file('python-icon.png')
-        with open(image_path, 'rb') as f:
-            blob = f.read()
+        blob = test_file_bytes('python-icon.png')
         image_stream = BytesIO(blob)
         return image_stream, _from_stream_, blob, image_
 
@@ -164,8 +162,7 @@ class DescribeImage(object):
     def from_path_fixture(self, _from_stream_, BytesIO_, stream_, image_):
         filename = 'python-icon.png'
         image_path = test_file(filename)
-        with open(image_path, 'rb') as f:
-            blob = f.read()
+        blob = test_file_bytes(filename)
         return image_path, _from_stream_, stream_, blob, filename, image_
 
     @pytest.fixture(params=['foobar.png', None])
@@ -4,6 +4,7 @@
 Utility functions for loading files for unit testing
 """
 
+import functools
 import os
 
 
@@ -59,3 +60,15 @@ def test_file(name):
     Return the absolute path to test file having *name*.
     """
     return absjoin(test_file_dir, name)
+
+
+@functools.lru_cache(maxsize=None)
+def test_file_bytes(name):
+    """
+    Return the bytes of the test file having *name*, read from disk at most
+    once per test session. The returned bytes are immutable and shared;
+    callers needing a stream should wrap them in a fresh BytesIO so each
+    test keeps an independent read position.
+    """
+    with open(test_file(name), 'rb') as f:
+        return f.read()